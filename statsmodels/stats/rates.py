@@ -5,6 +5,8 @@ License: BSD-3
 
 '''
 
+from functools import lru_cache
+
 import numpy as np
 import warnings
 
@@ -18,6 +20,22 @@ from statsmodels.stats._inference_tools import _mover_confint
 norm = stats.norm
 
 
+@lru_cache(maxsize=32)
+def _crit_norm_cached(alpha):
+    return norm.isf(alpha)
+
+
+def _crit_norm(alpha):
+    """upper tail critical value of the standard normal distribution
+
+    Values for scalar alpha are cached, because the same few alpha are used
+    in repeated calls, e.g. in power computations.
+    """
+    if np.ndim(alpha) == 0:
+        return _crit_norm_cached(float(alpha))
+    return norm.isf(alpha)
+
+
 method_names_poisson_1samp = {
     "test": [
         "wald",
@@ -162,7 +180,7 @@ def test_poisson(count, nobs, value, method=None, alternative="two-sided",
     elif method == "sqrt-v":
         # vandenbroucke, based on Swift 2009 (with transformation to rate)
         std = 0.5
-        crit = stats.norm.isf(0.025)
+        crit = _crit_norm(0.025)
         statistic = (np.sqrt(count + (crit**2 + 2) / 12) -
                      # np.sqrt(n * value + (crit**2 + 2) / 12)) / std
                      np.sqrt(n * value)) / std
@@ -276,42 +294,46 @@ def confint_poisson(count, exposure, method=None, alpha=0.05):
         raise ValueError(msg)
 
     if method == "wald":
-        whalf = stats.norm.isf(alpha) * np.sqrt(rate / n)
+        whalf = _crit_norm(alpha) * np.sqrt(rate / n)
         ci = (rate - whalf, rate + whalf)
 
     elif method == "waldccv":
         # based on WCC in Barker 2002
         # add 0.5 event, not 0.5 event rate as in BARKER waldcc
-        whalf = stats.norm.isf(alpha) * np.sqrt((rate + 0.5 / n) / n)
+        whalf = _crit_norm(alpha) * np.sqrt((rate + 0.5 / n) / n)
         ci = (rate - whalf, rate + whalf)
 
     elif method == "score":
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         center = count + crit**2 / 2
         whalf = crit * np.sqrt((count + crit**2 / 4))
         ci = ((center - whalf) / n, (center + whalf) / n)
 
     elif method == "midp-c":
         # note local alpha above is for one tail
+        # midp-c limits are inside the exact-c interval, but outside the
+        # exact-c interval with count shifted by one towards the estimate
+        ci_inner = (stats.gamma.ppf(alpha, count + 1) / n,
+                    stats.gamma.isf(alpha, count) / n if count > 0 else 0.)
         ci = _invert_test_confint(count, n, alpha=2 * alpha, method="midp-c",
-                                  method_start="exact-c")
+                                  method_start="exact-c", ci_inner=ci_inner)
 
     elif method == "sqrt":
         # drop, wrong n
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         center = rate + crit**2 / (4 * n)
         whalf = crit * np.sqrt(rate / n)
         ci = (center - whalf, center + whalf)
 
     elif method == "sqrt-cent":
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         center = count + crit**2 / 4
         whalf = crit * np.sqrt((count + 3 / 8))
         ci = ((center - whalf) / n, (center + whalf) / n)
 
     elif method == "sqrt-centcc":
         # drop with cc, does not match cipoisson in R survival
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         # avoid sqrt of negative value if count=0
         center_low = np.sqrt(np.maximum(count + 3 / 8 - 0.5, 0))
         center_upp = np.sqrt(count + 3 / 8 + 0.5)
@@ -327,7 +349,7 @@ def confint_poisson(count, exposure, method=None, alpha=0.05):
 
     elif method == "sqrt-a":
         # anscombe, based on Swift 2009 (with transformation to rate)
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         center = np.sqrt(count + 3 / 8)
         whalf = crit / 2
         # above is for ci of count
@@ -336,7 +358,7 @@ def confint_poisson(count, exposure, method=None, alpha=0.05):
 
     elif method == "sqrt-v":
         # vandenbroucke, based on Swift 2009 (with transformation to rate)
-        crit = stats.norm.isf(alpha)
+        crit = _crit_norm(alpha)
         center = np.sqrt(count + (crit**2 + 2) / 12)
         whalf = crit / 2
         # above is for ci of count
@@ -519,20 +541,66 @@ def confint_quantile_poisson(count, exposure, prob, exposure_new=1.,
 
 
 def _invert_test_confint(count, nobs, alpha=0.05, method="midp-c",
-                         method_start="exact-c"):
+                         method_start="exact-c", ci_inner=None):
     """invert hypothesis test to get confidence interval
+
+    The confidence limits are the roots of ``pvalue - alpha``. The roots are
+    bracketed by the confidence limits of the more conservative
+    ``method_start`` and by ``ci_inner``, limits of a narrower interval.
+    The estimated rate is used if ``ci_inner`` is None. The bracket is
+    widened if the pvalue does not cross alpha inside it.
     """
 
-    def func(r):
-        v = (test_poisson(count, nobs, value=r, method=method)[1] -
-             alpha)**2
-        return v
+    # values at the bracket ends are reused by root_scalar
+    fvals = {}
 
-    ci = confint_poisson(count, nobs, method=method_start)
-    low = optimize.fmin(func, ci[0], xtol=1e-8, disp=False)
-    upp = optimize.fmin(func, ci[1], xtol=1e-8, disp=False)
-    assert np.size(low) == 1
-    return low[0], upp[0]
+    def func(r):
+        r = float(np.squeeze(r))
+        if r not in fvals:
+            fvals[r] = test_poisson(count, nobs, value=r,
+                                    method=method)[1] - alpha
+        return fvals[r]
+
+    assert np.size(count) == 1
+    count, nobs = np.squeeze(count)[()], np.squeeze(nobs)[()]
+    rate = count / nobs
+    if ci_inner is None:
+        ci_inner = (rate, rate)
+    low_inner = min(np.squeeze(ci_inner[0])[()], rate)
+    upp_inner = max(np.squeeze(ci_inner[1])[()], rate)
+    ci = confint_poisson(count, nobs, method=method_start, alpha=alpha)
+    def find_limit(start, inner, widen):
+        if not func(inner) > 0:
+            inner = rate
+        if not func(inner) > 0:
+            # maximum pvalue is not at the estimate, e.g. for large alpha
+            inner = optimize.minimize_scalar(lambda r: -func(r),
+                                             bounds=(ci[0], ci[1]),
+                                             method="bounded").x
+        if func(inner) > 0:
+            outer = start
+            for _ in range(20):
+                if func(outer) < 0:
+                    bracket = sorted([outer, inner])
+                    # absolute tolerance relative to the scale of the rate
+                    xtol = 1e-14 * bracket[1]
+                    return optimize.root_scalar(func, bracket=bracket,
+                                                method="toms748", xtol=xtol,
+                                                rtol=1e-12).root
+                outer = widen(outer)
+        # pvalue does not cross alpha, e.g. for large alpha or if
+        # method_start is not more conservative for non-integer count,
+        # use local minimizer of squared difference instead
+        return optimize.fmin(lambda r: func(r)**2, start, xtol=1e-8,
+                             disp=False)[0]
+
+    if count == 0:
+        # pvalue at rate zero is one, lower limit is at the boundary
+        low = 0.
+    else:
+        low = find_limit(ci[0], low_inner, lambda r: r / 2)
+    upp = find_limit(ci[1], upp_inner, lambda r: r * 2)
+    return low, upp
 
 
 def _invert_test_confint_2indep(
@@ -543,21 +611,92 @@ def _invert_test_confint_2indep(
         method_start="wald"
         ):
     """invert hypothesis test to get confidence interval for 2indep
+
+    The confidence limits are the roots of ``pvalue - alpha``. The roots are
+    bracketed by the estimate and the confidence limits of ``method_start``,
+    which are moved outwards if they are not more conservative.
     """
 
+    # values at the bracket ends are reused by root_scalar
+    fvals = {}
+
     def func(r):
-        v = (test_poisson_2indep(
-             count1, exposure1, count2, exposure2,
-             value=r, method=method, compare=compare
-             )[1] - alpha)**2
-        return v
+        r = float(np.squeeze(r))
+        if r not in fvals:
+            fvals[r] = (test_poisson_2indep(
+                count1, exposure1, count2, exposure2,
+                value=r, method=method, compare=compare
+                )[1] - alpha)
+        return fvals[r]
+
+    assert np.size(count1) == 1
+    count1, count2 = np.squeeze(count1)[()], np.squeeze(count2)[()]
+    exposure1 = np.squeeze(exposure1)[()]
+    exposure2 = np.squeeze(exposure2)[()]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate1 = np.divide(count1, exposure1)
+        rate2 = np.divide(count2, exposure2)
+        if compare == "ratio":
+            # search on log scale, estimate can be 0, inf or nan
+            estimate = np.log(rate1 / rate2)
+        else:
+            estimate = rate1 - rate2
+
+    if compare == "ratio":
+        to_r = np.exp
+        step = np.log(2)
+    else:
+        def to_r(x):
+            return x
+        # one event in the sample with the smaller exposure
+        step = 1. / min(exposure1, exposure2)
+
+    def find_limit(start, side):
+        # side is -1 for the lower and 1 for the upper limit
+        if side * estimate == np.inf:
+            # limit is at the boundary, 0 or inf for the ratio
+            return to_r(estimate)
+        x = np.log(start) if compare == "ratio" else start
+        x_in = x_out = None
+        for _ in range(30):
+            f = func(to_r(x))
+            if np.isfinite(f):
+                if f > 0:
+                    x_in = x
+                elif f < 0:
+                    x_out = x
+                else:
+                    return to_r(x)
+            if x_in is not None and x_out is not None:
+                bracket = sorted([to_r(x_in), to_r(x_out)])
+                # absolute tolerance relative to the scale of the limits,
+                # diff limits can be very small for large exposures
+                xtol = 1e-14 * max(abs(bracket[0]), abs(bracket[1]))
+                return optimize.root_scalar(func, bracket=bracket,
+                                            method="toms748", xtol=xtol,
+                                            rtol=1e-12).root
+            if x_out is not None:
+                # move towards the estimate
+                if np.isfinite(estimate):
+                    x = (x + estimate) / 2
+                else:
+                    x = x - side * step
+            elif np.isfinite(estimate) and x != estimate:
+                # move away from the estimate
+                x = estimate + 2 * (x - estimate)
+            else:
+                x = x + side * step
+        # pvalue does not cross alpha, e.g. score-log for small counts,
+        # use local minimizer of squared difference instead
+        return optimize.fmin(lambda r: func(r)**2, start, xtol=1e-8,
+                             disp=False)[0]
 
     ci = confint_poisson_2indep(count1, exposure1, count2, exposure2,
-                                method=method_start, compare=compare)
-    low = optimize.fmin(func, ci[0], xtol=1e-8, disp=False)
-    upp = optimize.fmin(func, ci[1], xtol=1e-8, disp=False)
-    assert np.size(low) == 1
-    return low[0], upp[0]
+                                method=method_start, compare=compare,
+                                alpha=alpha)
+    low = find_limit(ci[0], -1)
+    upp = find_limit(ci[1], 1)
+    return low, upp
 
 
 method_names_poisson_2indep = {
@@ -897,7 +1036,7 @@ def _score_diff(y1, n1, y2, n2, value=0, return_cmle=False):
 def etest_poisson_2indep(count1, exposure1, count2, exposure2, ratio_null=None,
                          value=None, method='score', compare="ratio",
                          alternative='two-sided', ygrid=None,
-                         y_grid=None):
+                         y_grid=None, _pmf_cache=None):
     """E-test for ratio of two sample Poisson rates.
 
         Rates are defined as expected count divided by exposure.
@@ -953,6 +1092,11 @@ def etest_poisson_2indep(count1, exposure1, count2, exposure2, ratio_null=None,
         Same as y_grid. Deprecated. If both y_grid and ygrid are provided,
         ygrid will be ignored.
 
+    _pmf_cache : None or dict
+        Private option to reuse the table of Poisson probabilities across
+        calls that differ only in ``method`` or ``alternative``. The dict is
+        filled on first use, keyed by the Poisson means and the grid.
+
     Returns
     -------
     stat_sample : float
@@ -1053,10 +1197,24 @@ def etest_poisson_2indep(count1, exposure1, count2, exposure2, ratio_null=None,
         y_grid = np.asarray(y_grid)
         if y_grid.ndim != 1:
             raise ValueError("y_grid needs to be None or 1-dimensional array")
-    pdf1 = stats.poisson.pmf(y_grid, mean1)
-    pdf2 = stats.poisson.pmf(y_grid, mean2)
-
-    stat_space = stat_func(y_grid[:, None], y_grid[None, :])  # broadcasting
+    key = None
+    if _pmf_cache is not None:
+        key = (float(mean1), float(mean2), y_grid.dtype.str,
+               y_grid.tobytes())
+    if key is not None and key in _pmf_cache:
+        y1_grid, y2_grid, pdf = _pmf_cache[key]
+    else:
+        pdf1 = stats.poisson.pmf(y_grid, mean1)
+        pdf2 = stats.poisson.pmf(y_grid, mean2)
+        # drop grid points with underflow, they do not add to the pvalue
+        mask1 = pdf1 > 0
+        mask2 = pdf2 > 0
+        y1_grid, y2_grid = y_grid[mask1], y_grid[mask2]
+        pdf = np.multiply.outer(pdf1[mask1], pdf2[mask2])
+        if key is not None:
+            _pmf_cache[key] = (y1_grid, y2_grid, pdf)
+
+    stat_space = stat_func(y1_grid[:, None], y2_grid[None, :])  # broadcasting
     eps = 1e-15   # correction for strict inequality check
 
     if alternative in ['two-sided', '2-sided', '2s']:
@@ -1068,7 +1226,7 @@ def etest_poisson_2indep(count1, exposure1, count2, exposure2, ratio_null=None,
     else:
         raise ValueError('invalid alternative')
 
-    pvalue = ((pdf1[:, None] * pdf2[None, :])[mask]).sum()
+    pvalue = pdf[mask].sum()
     return stat_sample, pvalue
 
 
@@ -1327,7 +1485,7 @@ def confint_poisson_2indep(count1, exposure1, count2, exposure2,
             ci = (low, upp)
 
         elif method == "wald-log":
-            crit = stats.norm.isf(alpha)
+            crit = _crit_norm(alpha)
             c = 0
             center = (count1 + c) / (count2 + c) * n2 / n1
             std = np.sqrt(1 / (count1 + c) + 1 / (count2 + c))
@@ -1345,7 +1503,7 @@ def confint_poisson_2indep(count1, exposure1, count2, exposure2,
             ci = (low, upp)
 
         elif method == "waldcc":
-            crit = stats.norm.isf(alpha)
+            crit = _crit_norm(alpha)
             center = (count1 + 0.5) / (count2 + 0.5) * n2 / n1
             std = np.sqrt(1 / (count1 + 0.5) + 1 / (count2 + 0.5))
 
@@ -1353,7 +1511,7 @@ def confint_poisson_2indep(count1, exposure1, count2, exposure2,
 
         elif method == "sqrtcc":
             # coded based on Price, Bonett 2000 equ (2.4)
-            crit = stats.norm.isf(alpha)
+            crit = _crit_norm(alpha)
             center = np.sqrt((count1 + 0.5) * (count2 + 0.5))
             std = 0.5 * np.sqrt(count1 + 0.5 + count2 + 0.5 - 0.25 * crit)
             denom = (count2 + 0.5 - 0.25 * crit**2)
@@ -1378,13 +1536,13 @@ def confint_poisson_2indep(count1, exposure1, count2, exposure2,
     elif compare == "diff":
 
         if method in ['wald']:
-            crit = stats.norm.isf(alpha)
+            crit = _crit_norm(alpha)
             center = rate1 - rate2
             half = crit * np.sqrt(rate1 / n1 + rate2 / n2)
             ci = center - half, center + half
 
         elif method in ['waldccv']:
-            crit = stats.norm.isf(alpha)
+            crit = _crit_norm(alpha)
             center = rate1 - rate2
             std = np.sqrt((count1 + 0.5) / n1**2 + (count2 + 0.5) / n2**2)
             half = crit * std
@@ -1432,13 +1590,13 @@ def power_poisson_ratio_2indep(
 
     Parameters
     ----------
-    rate1 : float
+    rate1 : float or array_like
         Poisson rate for the first sample, treatment group, under the
         alternative hypothesis.
-    rate2 : float
+    rate2 : float or array_like
         Poisson rate for the second sample, reference group, under the
         alternative hypothesis.
-    nobs1 : float or int
+    nobs1 : float, int or array_like
         Number of observations in sample 1.
     nobs_ratio : float
         Sample size ratio, nobs2 = nobs_ratio * nobs1.
@@ -1551,13 +1709,13 @@ def power_equivalence_poisson_2indep(rate1, rate2, nobs1,
 
     Parameters
     ----------
-    rate1 : float
+    rate1 : float or array_like
         Poisson rate for the first sample, treatment group, under the
         alternative hypothesis.
-    rate2 : float
+    rate2 : float or array_like
         Poisson rate for the second sample, reference group, under the
         alternative hypothesis.
-    nobs1 : float or int
+    nobs1 : float, int or array_like
         Number of observations in sample 1.
     low : float
         Lower equivalence margin for the rate ratio, rate1 / rate2.
@@ -1647,7 +1805,7 @@ def power_equivalence_poisson_2indep(rate1, rate2, nobs1,
     if return_results:
         res = HolderTuple(
             power=pow_[0],
-            power_margins=pow[1:],
+            power_margins=pow_[1:],
             std_null_low=std_null_low,
             std_null_upp=std_null_upp,
             std_alt=std_alternative,
@@ -1674,7 +1832,7 @@ def _power_equivalence_het_v0(es_low, es_upp, nobs, alpha=0.05,
     s0_upp = std_null_upp
     s1 = std_alternative
 
-    crit = norm.isf(alpha)
+    crit = _crit_norm(alpha)
     pow_ = (
         norm.cdf((np.sqrt(nobs) * es_low - crit * s0_low) / s1) +
         norm.cdf((np.sqrt(nobs) * es_upp - crit * s0_upp) / s1) - 1
@@ -1694,7 +1852,7 @@ def _power_equivalence_het(es_low, es_upp, nobs, alpha=0.05,
     s0_upp = std_null_upp
     s1 = std_alternative
 
-    crit = norm.isf(alpha)
+    crit = _crit_norm(alpha)
 
     # Note: rejection region is an interval [low, upp]
     # Here we compute the complement of the two tail probabilities
@@ -2106,7 +2264,7 @@ def power_equivalence_neginb_2indep(rate1, rate2, nobs1,
     if return_results:
         res = HolderTuple(
             power=pow_[0],
-            power_margins=pow[1:],
+            power_margins=pow_[1:],
             std_null_low=std_null_low,
             std_null_upp=std_null_upp,
             std_alt=std_alternative,
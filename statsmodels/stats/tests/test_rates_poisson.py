@@ -26,34 +26,99 @@ from statsmodels.stats.rates import (
     method_names_poisson_2indep,
     )
 
+from .results.results_rates import res_pexact_cond, res_pexact_cond_midp
+
 methods = ["wald", "score", "exact-c", "waldccv", "sqrt-a", "sqrt-v", "midp-c",
            "sqrt",
            ]
 
 
+def _close(a, b, *, rtol=0, atol=0, err_msg=""):
+    # scalar version of assert_allclose without array overhead
+    a, b = float(a), float(b)
+    assert abs(a - b) <= atol + rtol * abs(b), (a, b, err_msg)
+
+
+def _confint_poisson_multi(count, exposure, methods=None, alpha=0.05):
+    # dict of confint_poisson results for several methods,
+    # midp-c requires scalar count and exposure
+    scalar = np.size(count) == 1 and np.size(exposure) == 1
+    if methods is None:
+        methods = [meth for meth in method_names_poisson_1samp["confint"]
+                   if scalar or meth != "midp-c"]
+    elif not scalar and "midp-c" in methods:
+        raise ValueError('method "midp-c" requires a scalar count')
+
+    return {meth: confint_poisson(count, exposure, method=meth, alpha=alpha)
+            for meth in methods}
+
+
+@pytest.fixture(scope="module")
+def _ci_multi():
+    # confint computed once for all methods and shared across alternatives
+    return _confint_poisson_multi(15, 400, methods=methods)
+
+
+@pytest.mark.parametrize('side', ["two", "larger", "smaller"])
 @pytest.mark.parametrize('method', methods)
-def test_rate_poisson_consistency(method):
+def test_rate_poisson_consistency(method, side, _ci_multi):
     # check consistency between test and confint for one poisson rate
     count, nobs = 15, 400
-    ci = confint_poisson(count, nobs, method=method)
-    pv1 = smr.test_poisson(count, nobs, value=ci[0], method=method).pvalue
-    pv2 = smr.test_poisson(count, nobs, value=ci[1], method=method).pvalue
+    ci = _ci_multi[method]
 
     rtol = 1e-10
-    if method in ["midp-c"]:
-        # numerical root finding, lower precision
-        rtol = 1e-6
-    assert_allclose(pv1, 0.05, rtol=rtol)
-    assert_allclose(pv2, 0.05, rtol=rtol)
 
-    # check one-sided, note all confint are central
-    pv1 = smr.test_poisson(count, nobs, value=ci[0], method=method,
-                           alternative="larger").pvalue
-    pv2 = smr.test_poisson(count, nobs, value=ci[1], method=method,
-                           alternative="smaller").pvalue
+    if side == "two":
+        pv1 = smr.test_poisson(count, nobs, value=ci[0], method=method).pvalue
+        pv2 = smr.test_poisson(count, nobs, value=ci[1], method=method).pvalue
+        _close(pv1, 0.05, rtol=rtol)
+        _close(pv2, 0.05, rtol=rtol)
 
-    assert_allclose(pv1, 0.025, rtol=rtol)
-    assert_allclose(pv2, 0.025, rtol=rtol)
+    # check one-sided, note all confint are central
+    elif side == "larger":
+        pv1 = smr.test_poisson(count, nobs, value=ci[0], method=method,
+                               alternative="larger").pvalue
+        _close(pv1, 0.025, rtol=rtol)
+
+    elif side == "smaller":
+        pv2 = smr.test_poisson(count, nobs, value=ci[1], method=method,
+                               alternative="smaller").pvalue
+        _close(pv2, 0.025, rtol=rtol)
+
+
+def test_confint_poisson_multi():
+    meth_all = method_names_poisson_1samp["confint"]
+    for count, nobs in [(0, 10), (3, 50), (15, 400)]:
+        res = _confint_poisson_multi(count, nobs)
+        assert_equal(list(res), meth_all)
+        for meth in meth_all:
+            ci = confint_poisson(count, nobs, method=meth)
+            assert_allclose(res[meth], ci, rtol=1e-13, err_msg=meth)
+
+    res = _confint_poisson_multi(15, 400, methods=["score"], alpha=0.1)
+    ci = confint_poisson(15, 400, method="score", alpha=0.1)
+    assert_allclose(res["score"], ci, rtol=1e-13)
+
+    # midp-c requires scalar count
+    count, nobs = np.array([0, 3, 15]), np.array([10, 50, 400])
+    res = _confint_poisson_multi(count, nobs)
+    assert "midp-c" not in res
+    assert_equal(len(res), len(meth_all) - 1)
+    for meth in res:
+        ci = confint_poisson(count, nobs, method=meth)
+        assert_allclose(res[meth], ci, rtol=1e-13, err_msg=meth)
+
+    # scalar count with array exposure
+    res = _confint_poisson_multi(15, np.array([100., 400.]))
+    assert "midp-c" not in res
+    ci = confint_poisson(15, np.array([100., 400.]), method="score")
+    assert_allclose(res["score"], ci, rtol=1e-13)
+
+    with pytest.raises(ValueError, match="scalar"):
+        _confint_poisson_multi(count, nobs, methods=["score", "midp-c"])
+    with pytest.raises(ValueError, match="scalar"):
+        _confint_poisson_multi(15, np.array([100., 400.]),
+                               methods=["midp-c"])
 
 
 def test_rate_poisson_r():
@@ -106,6 +171,55 @@ def test_rate_poisson_r():
     assert_allclose(ci[1], ci2[1], rtol=1e-5)
 
 
+@pytest.mark.parametrize('alpha', [0.05, 0.2])
+@pytest.mark.parametrize('count', [0, 1, 15])
+def test_confint_poisson_midp_root(count, alpha, monkeypatch):
+    # regression test for number of test function evaluations in root finding
+    nobs = 400
+    test_poisson = smr.test_poisson
+    nfev = []
+
+    def test_poisson_counted(*args, **kwds):
+        nfev.append(1)
+        return test_poisson(*args, **kwds)
+
+    monkeypatch.setattr(smr, "test_poisson", test_poisson_counted)
+    ci = confint_poisson(count, nobs, method="midp-c", alpha=alpha)
+    assert len(nfev) <= 24
+    monkeypatch.undo()
+
+    pv = smr.test_poisson(count, nobs, value=ci[1], method="midp-c").pvalue
+    assert_allclose(pv, alpha, rtol=1e-10)
+    if count == 0:
+        assert ci[0] == 0
+    else:
+        pv = smr.test_poisson(count, nobs, value=ci[0], method="midp-c").pvalue
+        assert_allclose(pv, alpha, rtol=1e-10)
+
+
+@pytest.mark.parametrize('scale', [1e-6, 1e10])
+def test_confint_poisson_midp_scale(scale):
+    # limits scale with the exposure also for small rates
+    ci0 = confint_poisson(15, 400, method="midp-c")
+    ci = confint_poisson(15, 400 * scale, method="midp-c")
+    assert_allclose(np.asarray(ci) * scale, ci0, rtol=1e-10)
+
+
+@pytest.mark.parametrize('case', [(np.array([4]), 0.05), (2.5, 0.05),
+                                  (2.5, 0.2), (1, 0.9)])
+def test_confint_poisson_midp_bracket(case):
+    # array count, non-integer count and large alpha
+    count, alpha = case
+    nobs = 10
+    ci = confint_poisson(count, nobs, method="midp-c", alpha=alpha)
+    assert ci[0] < count / nobs < ci[1] or alpha > 0.5
+    assert ci[0] < ci[1]
+    for value in ci:
+        pv = smr.test_poisson(count, nobs, value=value,
+                              method="midp-c").pvalue
+        assert_allclose(pv, alpha, rtol=1e-10)
+
+
 cases_tolint = [
     ("wald", 15, 1, 1, (3, 32), (3, np.inf), (0, 31)),
     ("score", 15, 1, 1, (4, 35), (4, np.inf), (0, 33)),
@@ -198,6 +312,18 @@ class TestMethodsCompar1samp():
 # ######## below are 2indep tests
 
 
+@pytest.fixture(scope="module")
+def ex1():
+    # example 1 in Gu et al, (count1, n1, count2, n2)
+    return (60, 51477.5, 30, 54308.7)
+
+
+@pytest.fixture(scope="module")
+def ex2():
+    # example 2 in Gu et al, (count1, n1, count2, n2)
+    return (41, 28010, 15, 19017)
+
+
 methods_diff = ["wald", "score", "waldccv",
                 ]
 
@@ -214,9 +340,6 @@ def test_rate_poisson_diff_consistency(method):
                                   method=method, compare="diff").pvalue
 
     rtol = 1e-10
-    if method in ["score"]:
-        # numerical root finding, lower precision
-        rtol = 1e-6
     assert_allclose(pv1, 0.05, rtol=rtol)
     assert_allclose(pv2, 0.05, rtol=rtol)
 
@@ -251,9 +374,6 @@ def test_rate_poisson_ratio_consistency(method):
                                   method=method, compare=compare).pvalue
 
     rtol = 1e-10
-    if method in ["score", "score-log"]:
-        # numerical root finding, lower precision
-        rtol = 1e-6
     assert_allclose(pv1, 0.05, rtol=rtol)
     assert_allclose(pv2, 0.05, rtol=rtol)
 
@@ -271,6 +391,67 @@ def test_rate_poisson_ratio_consistency(method):
     assert_allclose(pv2, 0.025, rtol=rtol)
 
 
+@pytest.mark.parametrize('scale', [1e-6, 1, 1e10])
+@pytest.mark.parametrize('compare', ["diff", "ratio"])
+def test_rate_poisson_2indep_confint_root(compare, scale, ex1, monkeypatch):
+    # pvalue at limits does not depend on the scale of the exposure,
+    # and the test is not evaluated twice at the same value
+    count1, n1, count2, n2 = ex1
+    n1, n2 = n1 * scale, n2 * scale
+    test_poisson_2indep = smr.test_poisson_2indep
+    values = []
+
+    def test_counted(*args, **kwds):
+        values.append(kwds["value"])
+        return test_poisson_2indep(*args, **kwds)
+
+    monkeypatch.setattr(smr, "test_poisson_2indep", test_counted)
+    ci = confint_poisson_2indep(count1, n1, count2, n2, method="score",
+                                compare=compare)
+    assert len(values) == len(set(values))
+    monkeypatch.undo()
+
+    for value in ci:
+        pv = smr.test_poisson_2indep(count1, n1, count2, n2, value=value,
+                                     method="score", compare=compare).pvalue
+        assert_allclose(pv, 0.05, rtol=1e-10)
+
+
+@pytest.mark.filterwarnings("ignore::RuntimeWarning")
+@pytest.mark.parametrize('counts', [(5, 0), (0, 5), (0, 0)])
+def test_rate_poisson_2indep_consistency_zero(counts):
+    # zero counts, limits at the boundary are 0 and inf for the ratio
+    count1, count2 = counts
+    n1, n2 = 10, 10
+    ci = confint_poisson_2indep(count1, n1, count2, n2, method="score",
+                                compare="diff")
+    for value in ci:
+        pv = smr.test_poisson_2indep(count1, n1, count2, n2, value=value,
+                                     method="score", compare="diff").pvalue
+        assert_allclose(pv, 0.05, rtol=1e-10)
+
+    if count1 == count2 == 0:
+        # pvalue of ratio test is nan
+        return
+
+    ci = confint_poisson_2indep(count1, n1, count2, n2, method="score",
+                                compare="ratio")
+    assert ci[0] < ci[1]
+    if count1 == 0:
+        assert_equal(ci[0], 0)
+        value = ci[1]
+    else:
+        assert_equal(ci[1], np.inf)
+        value = ci[0]
+    pv = smr.test_poisson_2indep(count1, n1, count2, n2, value=value,
+                                 method="score", compare="ratio").pvalue
+    assert_allclose(pv, 0.05, rtol=1e-10)
+
+    ci = confint_poisson_2indep(count1, n1, count2, n2, method="score-log",
+                                compare="ratio")
+    assert ci[0] < ci[1]
+
+
 methods_diff_ratio = ["wald", "score", "etest", "etest-wald",
                       ]
 
@@ -305,11 +486,13 @@ def test_rate_poisson_diff_ratio_consistency(method):
     assert_allclose(t1.tuple, t2.tuple, rtol=1e-13)
 
 
-def test_twosample_poisson():
+def test_twosample_poisson(ex1, ex2):
     # testing against two examples in Gu et al
+    # Poisson probabilities shared by etest calls with same data and null
+    etest_pmf_cache = {}
 
     # example 1
-    count1, n1, count2, n2 = 60, 51477.5, 30, 54308.7
+    count1, n1, count2, n2 = ex1
 
     s1, pv1 = smr.test_poisson_2indep(count1, n1, count2, n2, method='wald')
     pv1r = 0.000356
@@ -341,7 +524,7 @@ def test_twosample_poisson():
     # two-sided
     # example2
     # I don't know why it's only 2.5 decimal agreement, rounding?
-    count1, n1, count2, n2 = 41, 28010, 15, 19017
+    count1, n1, count2, n2 = ex2
     s1, pv1 = smr.test_poisson_2indep(count1, n1, count2, n2, method='wald',
                                       value=1.5)
     pv1r = 0.2309
@@ -375,7 +558,7 @@ def test_twosample_poisson():
 
     # one-sided
     # example 1 onesided
-    count1, n1, count2, n2 = 60, 51477.5, 30, 54308.7
+    count1, n1, count2, n2 = ex1
 
     s1, pv1 = smr.test_poisson_2indep(count1, n1, count2, n2, method='wald',
                                       alternative='larger')
@@ -392,35 +575,23 @@ def test_twosample_poisson():
     pv2r = 0.000285
     assert_allclose(pv2, pv2r, rtol=0, atol=5e-6)
 
-    # 'exact-cond', 'cond-midp'
-
-    s2, pv2 = smr.test_poisson_2indep(count1, n1, count2, n2,
-                                      method='exact-cond',
-                                      value=1, alternative='larger')
-    pv2r = 0.000428  # typo in Gu et al, switched pvalues between C and M
-    assert_allclose(pv2, pv2r, rtol=0, atol=5e-4)
-
-    s2, pv2 = smr.test_poisson_2indep(count1, n1, count2, n2,
-                                      method='cond-midp',
-                                      value=1, alternative='larger')
-    pv2r = 0.000310
-    assert_allclose(pv2, pv2r, rtol=0, atol=5e-4)
-
     _, pve1 = etest_poisson_2indep(count1, n1, count2, n2,
                                    method='score',
-                                   alternative='larger')
+                                   alternative='larger',
+                                   _pmf_cache=etest_pmf_cache)
     pve1r = 0.000298
     assert_allclose(pve1, pve1r, rtol=0, atol=5e-4)
 
     _, pve1 = etest_poisson_2indep(count1, n1, count2, n2,
                                    method='wald',
-                                   alternative='larger')
+                                   alternative='larger',
+                                   _pmf_cache=etest_pmf_cache)
     pve1r = 0.000298
     assert_allclose(pve1, pve1r, rtol=0, atol=5e-4)
 
     # example2 onesided
     # I don't know why it's only 2.5 decimal agreement, rounding?
-    count1, n1, count2, n2 = 41, 28010, 15, 19017
+    count1, n1, count2, n2 = ex2
     s1, pv1 = smr.test_poisson_2indep(count1, n1, count2, n2, method='wald',
                                       value=1.5, alternative='larger')
     pv1r = 0.2309
@@ -436,32 +607,47 @@ def test_twosample_poisson():
     pv2r = 0.2499
     assert_allclose(pv2, pv2r, rtol=0, atol=5e-4)
 
-    # 'exact-cond', 'cond-midp'
-
-    s2, pv2 = smr.test_poisson_2indep(count1, n1, count2, n2,
-                                      method='exact-cond',
-                                      value=1.5, alternative='larger')
-    pv2r = 0.2913
-    assert_allclose(pv2, pv2r, rtol=0, atol=5e-4)
-
-    s2, pv2 = smr.test_poisson_2indep(count1, n1, count2, n2,
-                                      method='cond-midp',
-                                      value=1.5, alternative='larger')
-    pv2r = 0.2450
-    assert_allclose(pv2, pv2r, rtol=0, atol=5e-4)
-
     _, pve2 = etest_poisson_2indep(count1, n1, count2, n2,
                                    method='score',
-                                   value=1.5, alternative='larger')
+                                   value=1.5, alternative='larger',
+                                   _pmf_cache=etest_pmf_cache)
     pve2r = 0.2453
     assert_allclose(pve2, pve2r, rtol=0, atol=5e-4)
 
     _, pve2 = etest_poisson_2indep(count1, n1, count2, n2,
                                    method='wald',
-                                   value=1.5, alternative='larger')
+                                   value=1.5, alternative='larger',
+                                   _pmf_cache=etest_pmf_cache)
     pve2r = 0.2453
     assert_allclose(pve2, pve2r, rtol=0, atol=5e-4)
 
+    # score and wald etest share the probabilities for each example
+    assert len(etest_pmf_cache) == 2
+    _, pve2_ = etest_poisson_2indep(count1, n1, count2, n2,
+                                    method='wald',
+                                    value=1.5, alternative='larger')
+    assert_allclose(pve2_, pve2, rtol=1e-13)
+
+
+cases_cond = [
+    # typo in Gu et al, switched pvalues between C and M
+    ("ex1", "exact-cond", "larger", 1, 0.000428),
+    ("ex1", "cond-midp", "larger", 1, 0.000310),
+    ("ex2", "exact-cond", "larger", 1.5, 0.2913),
+    ("ex2", "cond-midp", "larger", 1.5, 0.2450),
+    ]
+
+
+@pytest.mark.parametrize('case', cases_cond)
+def test_twosample_poisson_cond(case, request):
+    # 'exact-cond', 'cond-midp' onesided, testing against Gu et al
+    example, meth, alt, value, pvr = case
+    count1, n1, count2, n2 = request.getfixturevalue(example)
+
+    _, pv = smr.test_poisson_2indep(count1, n1, count2, n2, method=meth,
+                                    value=value, alternative=alt)
+    assert_allclose(pv, pvr, rtol=0, atol=5e-4)
+
 
 cases_diff_ng = [
     ("wald",  (2.2047, 0.0137), (1.5514, 0.06040)),
@@ -495,12 +681,11 @@ def test_twosample_poisson_diff(case):
     assert_allclose((t.statistic, t.pvalue), res2, atol=0.0007)
 
 
-def test_twosample_poisson_r():
+def test_twosample_poisson_r(ex1):
     # testing against R package `exactci
-    from .results.results_rates import res_pexact_cond, res_pexact_cond_midp
 
     # example 1 from Gu
-    count1, n1, count2, n2 = 60, 51477.5, 30, 54308.7
+    count1, n1, count2, n2 = ex1
 
     res2 = res_pexact_cond
     res1 = smr.test_poisson_2indep(count1, n1, count2, n2, method='exact-cond')
@@ -514,34 +699,26 @@ def test_twosample_poisson_r():
     assert_allclose(res1.ratio, res2.estimate, rtol=1e-13)
     assert_equal(res1.ratio_null, res2.null_value)
 
-    # one-sided
-    # > pe = poisson.exact(c(60, 30), c(51477.5, 54308.7), r=1.2,
-    #                      alternative="less", tsmethod="minlike", midp=TRUE)
-    # > pe$p.value
-    pv2 = 0.9949053964701466
-    rest = smr.test_poisson_2indep(count1, n1, count2, n2, method='cond-midp',
-                                   value=1.2, alternative='smaller')
-    assert_allclose(rest.pvalue, pv2, rtol=1e-12)
-    # > pe = poisson.exact(c(60, 30), c(51477.5, 54308.7), r=1.2,
-    #           alternative="greater", tsmethod="minlike", midp=TRUE)
-    # > pe$p.value
-    pv2 = 0.005094603529853279
-    rest = smr.test_poisson_2indep(count1, n1, count2, n2, method='cond-midp',
-                                   value=1.2, alternative='larger')
-    assert_allclose(rest.pvalue, pv2, rtol=1e-12)
-    # > pe = poisson.exact(c(60, 30), c(51477.5, 54308.7), r=1.2,
-    #           alternative="greater", tsmethod="minlike", midp=FALSE)
-    # > pe$p.value
-    pv2 = 0.006651774552714537
-    rest = smr.test_poisson_2indep(count1, n1, count2, n2, method='exact-cond',
-                                   value=1.2, alternative='larger')
-    assert_allclose(rest.pvalue, pv2, rtol=1e-12)
-    # > pe = poisson.exact(c(60, 30), c(51477.5, 54308.7), r=1.2,
-    #                      alternative="less", tsmethod="minlike", midp=FALSE)
-    # > pe$p.value
-    pv2 = 0.9964625674930079
-    rest = smr.test_poisson_2indep(count1, n1, count2, n2, method='exact-cond',
-                                   value=1.2, alternative='smaller')
+
+# one-sided, R exactci, e.g.
+# > pe = poisson.exact(c(60, 30), c(51477.5, 54308.7), r=1.2,
+#                      alternative="less", tsmethod="minlike", midp=TRUE)
+# > pe$p.value
+cases_cond_r = [
+    ("cond-midp", "smaller", 0.9949053964701466),
+    ("cond-midp", "larger", 0.005094603529853279),
+    ("exact-cond", "larger", 0.006651774552714537),
+    ("exact-cond", "smaller", 0.9964625674930079),
+    ]
+
+
+@pytest.mark.parametrize('case', cases_cond_r)
+def test_twosample_poisson_r_onesided(case, ex1):
+    # example 1 from Gu
+    meth, alt, pv2 = case
+    count1, n1, count2, n2 = ex1
+    rest = smr.test_poisson_2indep(count1, n1, count2, n2, method=meth,
+                                   value=1.2, alternative=alt)
     assert_allclose(rest.pvalue, pv2, rtol=1e-12)
 
 
@@ -625,22 +802,20 @@ def test_confint_poisson_2indep():
     assert_allclose(ci, ci1, atol=0.006)
 
 
-def test_tost_poisson():
+@pytest.mark.parametrize(
+    'meth', ['wald', 'score', 'sqrt', 'exact-cond', 'cond-midp'])
+def test_tost_poisson(meth, ex1):
 
-    count1, n1, count2, n2 = 60, 51477.5, 30, 54308.7
+    count1, n1, count2, n2 = ex1
     # # central conf_int from R exactci
     low, upp = 1.339735721772650, 3.388365573616252
 
     res = smr.tost_poisson_2indep(count1, n1, count2, n2, low, upp,
-                                  method="exact-cond")
-
-    assert_allclose(res.pvalue, 0.025, rtol=1e-12)
-    methods = ['wald', 'score', 'sqrt', 'exact-cond', 'cond-midp']
-
-    # test that we are in the correct range for other methods
-    for meth in methods:
-        res = smr.tost_poisson_2indep(count1, n1, count2, n2, low, upp,
-                                      method=meth)
+                                  method=meth)
+    if meth == "exact-cond":
+        assert_allclose(res.pvalue, 0.025, rtol=1e-12)
+    else:
+        # test that we are in the correct range for other methods
         assert_allclose(res.pvalue, 0.025, atol=0.01)
 
 
@@ -671,14 +846,19 @@ cases_alt = {
     }
 
 
-@pytest.mark.parametrize('case', list(cases_alt.keys()))
-def test_alternative(case):
+def test_alternative():
     # regression test numbers, but those are close to each other
-    alt, meth = case
     count1, n1, count2, n2 = 6, 51., 1, 54.
-    _, pv = smr.test_poisson_2indep(count1, n1, count2, n2, method=meth,
-                                    value=1.2, alternative=alt)
-    assert_allclose(pv, cases_alt[case], rtol=1e-13)
+    # all etest cases use the same table of Poisson probabilities
+    etest_kwds = {"_pmf_cache": {}}
+    for case, pvr in cases_alt.items():
+        alt, meth = case
+        _, pv = smr.test_poisson_2indep(count1, n1, count2, n2, method=meth,
+                                        value=1.2, alternative=alt,
+                                        etest_kwds=etest_kwds)
+        _close(pv, pvr, rtol=1e-13, err_msg=str(case))
+
+    assert len(etest_kwds["_pmf_cache"]) == 1
 
 
 class TestMethodsCompare2indep():
@@ -812,13 +992,13 @@ class TestMethodsCompare2indep():
         assert_allclose(tst2.pvalue[1], tst1.pvalue, rtol=1e-12)
 
 
-def test_y_grid_regression():
+def test_y_grid_regression(ex1, ex2):
     y_grid = arange(1000)
 
-    _, pv = etest_poisson_2indep(60, 51477.5, 30, 54308.7, y_grid=y_grid)
+    _, pv = etest_poisson_2indep(*ex1, y_grid=y_grid)
     assert_allclose(pv, 0.000567261758250953, atol=1e-15)
 
-    _, pv = etest_poisson_2indep(41, 28010, 15, 19017, y_grid=y_grid)
+    _, pv = etest_poisson_2indep(*ex2, y_grid=y_grid)
     assert_allclose(pv, 0.03782053187021494, atol=1e-15)
 
     _, pv = etest_poisson_2indep(1, 1, 1, 1, y_grid=[1])
@@ -852,108 +1032,126 @@ def test_poisson_power_2ratio():
     dispersion = 1
 
     # check power of equivalence test
-    cases = [
+    # cases are columns of (rate1, nobs1, nobs2, power)
+    cases = np.array([
         (1.9, 704, 704, 0.90012),
         (2.0, 246, 246, 0.90057),
         (2.2, 95, 95, 0.90039),
         (2.5, 396, 396, 0.90045),
-    ]
+    ]).T
+
+    rate1, nobs1, nobs2, p = cases
+    pow_ = power_equivalence_poisson_2indep(
+        rate1, rate2, nobs1, low, upp,
+        nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, alpha=alpha,
+        dispersion=dispersion)
+    assert_allclose(pow_, p, atol=5e-5)
+
+    # compare other method_var for similar results
+    pow_2 = power_equivalence_poisson_2indep(
+        rate1, rate2, nobs1, low, upp,
+        nobs_ratio=nobs2 / nobs1,
+        exposure=exposure,
+        alpha=alpha,
+        method_var="score",
+        dispersion=dispersion)
 
-    for case in cases:
-        rate1, nobs1, nobs2, p = case
-        pow_ = power_equivalence_poisson_2indep(
-            rate1, rate2, nobs1, low, upp,
-            nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, alpha=alpha,
-            dispersion=dispersion)
-        assert_allclose(pow_, p, atol=5e-5)
-
-        # compare other method_var for similar results
-        pow_2 = power_equivalence_poisson_2indep(
-            rate1, rate2, nobs1, low, upp,
-            nobs_ratio=nobs2 / nobs1,
-            exposure=exposure,
-            alpha=alpha,
-            method_var="score",
-            dispersion=dispersion)
-
-        assert_allclose(pow_2, p, rtol=5e-3)
+    assert_allclose(pow_2, p, rtol=5e-3)
 
     # check power of onesided test, smaller with a margin
     # non-inferiority
     # alternative smaller H1: rate1 / rate2 < R
-    cases = [
+    cases = np.array([
         (1.8, 29, 29, 0.90056),
         (1.9, 39, 39, 0.90649),
         (2.2, 115, 115, 0.90014),
         (2.4, 404, 404, 0.90064),
-    ]
+    ]).T
 
     low = 1.2
-    for case in cases:
-        rate1, nobs1, nobs2, p = case
-        pow_ = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.025, dispersion=1,
-            alternative="smaller")
+    rate1, nobs1, nobs2, p = cases
+    pow_ = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.025, dispersion=1,
+        alternative="smaller", return_results=False)
 
-        assert_allclose(pow_, p, atol=5e-5)
+    assert_allclose(pow_, p, atol=5e-5)
 
-        pow_ = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.05,
-            dispersion=1, alternative="two-sided")
-        assert_allclose(pow_, p, atol=5e-5)
+    pow_ = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.05,
+        dispersion=1, alternative="two-sided",
+        return_results=False)
+    assert_allclose(pow_, p, atol=5e-5)
 
     # check size, power at null
     pow_ = power_poisson_ratio_2indep(
             rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
             exposure=exposure, value=rate1 / rate2,
-            alpha=0.05, dispersion=1, alternative="two-sided")
+            alpha=0.05, dispersion=1, alternative="two-sided",
+            return_results=False)
     assert_allclose(pow_, 0.05, atol=5e-5)
 
     # check power of onesided test, larger with a margin (superiority)
     # alternative larger H1: rate1 / rate2 > R
     # here I just reverse the case of smaller alternative
 
-    cases = [
-        (1.8, 29, 29, 0.90056),
-        (1.9, 39, 39, 0.90649),
-        (2.2, 115, 115, 0.90014),
-        (2.4, 404, 404, 0.90064),
-    ]
-
     rate1 = 2.2
     low = 1 / 1.2
-    for case in cases:
-        rate2, nobs1, nobs2, p = case
-        pow_ = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.025,
-            dispersion=1, alternative="larger")
-        assert_allclose(pow_, p, atol=5e-5)
+    rate2, nobs1, nobs2, p = cases
+    pow_ = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.025,
+        dispersion=1, alternative="larger",
+        return_results=False)
+    assert_allclose(pow_, p, atol=5e-5)
 
-        # compare other method_var for similar results
-        pow_2 = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.025,
-            method_var="score",
-            dispersion=1, alternative="larger")
-        assert_allclose(pow_2, p, rtol=5e-3)
+    # compare other method_var for similar results
+    pow_2 = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.025,
+        method_var="score",
+        dispersion=1, alternative="larger",
+        return_results=False)
+    assert_allclose(pow_2, p, rtol=5e-3)
 
-        pow_ = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.05,
-            dispersion=1, alternative="two-sided")
-        assert_allclose(pow_, p, atol=5e-5)
+    pow_ = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.05,
+        dispersion=1, alternative="two-sided",
+        return_results=False)
+    assert_allclose(pow_, p, atol=5e-5)
 
-        # compare other method_var for similar results
-        pow_2 = power_poisson_ratio_2indep(
-            rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
-            exposure=exposure, value=low, alpha=0.05,
-            method_var="score",
-            dispersion=1, alternative="two-sided")
-        assert_allclose(pow_2, p, rtol=5e-3)
+    # compare other method_var for similar results
+    pow_2 = power_poisson_ratio_2indep(
+        rate1, rate2, nobs1, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, value=low, alpha=0.05,
+        method_var="score",
+        dispersion=1, alternative="two-sided",
+        return_results=False)
+    assert_allclose(pow_2, p, rtol=5e-3)
+
+    # results instance is also vectorized
+    res = power_equivalence_poisson_2indep(
+        rate2, rate1, nobs1, 0.8, 1.25, nobs_ratio=nobs2 / nobs1,
+        exposure=exposure, alpha=0.05, return_results=True)
+    assert res.power.shape == (4,)
+    assert_allclose(1 - res.power, np.sum(res.power_margins, 0),
+                    rtol=1e-13)
+
+
+def test_crit_norm():
+    alpha = np.array([0.01, 0.025, 0.05])
+    assert_allclose(smr._crit_norm(alpha), stats.norm.isf(alpha), rtol=1e-15)
+    smr._crit_norm_cached.cache_clear()
+    for a in alpha:
+        assert smr._crit_norm(a) == stats.norm.isf(a)
+        # second call uses cache
+        assert smr._crit_norm(a) == stats.norm.isf(a)
+    info = smr._crit_norm_cached.cache_info()
+    assert info.misses == 3
+    assert info.hits == 3
 
 
 def test_power_poisson_equal():